@@ -0,0 +1,98 @@
+"""
+Scoring kernels for FallbackRetriever
+Uses numba-compiled parallel loops when numba is installed, otherwise scipy's
+CSR mat-vec writing into the caller's buffer
+"""
+
+import os
+import threading
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    # Private but long-stable: accumulates A @ x into a caller-supplied buffer
+    from scipy.sparse._sparsetools import csr_matvec
+    _HAS_CSR_MATVEC = True
+except ImportError:
+    _HAS_CSR_MATVEC = False
+
+# Retrieval runs on executor threads. The workqueue threading layer aborts the
+# process if a parallel kernel is entered concurrently, and the tbb layer hangs
+# interpreter shutdown once it was first launched off the main thread. Prefer
+# omp, fall back to workqueue (never tbb), and serialize entry to the kernel.
+if _HAS_NUMBA and not (os.getenv("NUMBA_THREADING_LAYER") or os.getenv("NUMBA_THREADING_LAYER_PRIORITY")):
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "workqueue", "tbb"]
+
+_kernel_lock = threading.Lock()
+
+# Below this many rows a query scores in tens of microseconds; splitting it
+# across numba's thread team costs more than it saves, and the serial kernel
+# needs no lock, so concurrent requests score side by side on their own threads
+PARALLEL_MIN_ROWS = 50_000
+
+if _HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _csr_dot(indptr, indices, data, q, out):
+        for i in prange(out.shape[0]):
+            s = 0.0
+            for j in range(indptr[i], indptr[i + 1]):
+                s += data[j] * q[indices[j]]
+            out[i] = s
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _csr_dot_serial(indptr, indices, data, q, out):
+        for i in range(out.shape[0]):
+            s = 0.0
+            for j in range(indptr[i], indptr[i + 1]):
+                s += data[j] * q[indices[j]]
+            out[i] = s
+
+
+def warm_kernels():
+    """
+    Compile (or load from the on-disk cache) the scoring kernels for the dtypes
+    FallbackRetriever uses, so the first search does not pay for JIT compilation
+    """
+    if not _HAS_NUMBA:
+        return
+    indptr = np.zeros(2, dtype=np.int32)
+    indices = np.zeros(0, dtype=np.int32)
+    data = np.zeros(0, dtype=np.float32)
+    with _kernel_lock:
+        # Memory-mapped caches are read-only, which numba compiles as a separate signature
+        for writeable in (True, False):
+            for a in (indptr, indices, data):
+                a.flags.writeable = writeable
+            for kernel in (_csr_dot, _csr_dot_serial):
+                kernel(indptr, indices, data, np.zeros(1, dtype=np.float32), np.empty(1, dtype=np.float32))
+
+
+def sparse_scores(matrix, q: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """
+    Dot every row of a CSR matrix with a dense query vector
+
+    Args:
+        matrix: scipy CSR matrix of shape (n_rows, n_features)
+        q: Dense 1-D query vector of length n_features
+        out: Preallocated 1-D output buffer of length n_rows
+
+    Returns:
+        The filled output buffer
+    """
+    if _HAS_NUMBA and out.shape[0] < PARALLEL_MIN_ROWS:
+        _csr_dot_serial(matrix.indptr, matrix.indices, matrix.data, q, out)
+    elif _HAS_NUMBA:
+        with _kernel_lock:
+            _csr_dot(matrix.indptr, matrix.indices, matrix.data, q, out)
+    elif _HAS_CSR_MATVEC:
+        out.fill(0.0)
+        csr_matvec(out.shape[0], q.shape[0], matrix.indptr, matrix.indices, matrix.data, q, out)
+    else:
+        out[:] = matrix @ q
+    return out
@@ -0,0 +1,134 @@
+"""
+Buffered analytics event writer for Kuapa AI
+Queues events in memory and bulk-inserts them from a background task
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Tuple
+
+import orjson
+from psycopg2.extras import execute_values
+
+from . import database
+from .logger import logger
+
+MAX_QUEUE_SIZE = 10000
+FLUSH_BATCH_SIZE = 500
+FLUSH_INTERVAL_S = 1.0
+
+_INSERT_SQL = "INSERT INTO analytics (user_id, event_type, event_data, created_at) VALUES %s"
+_INSERT_TEMPLATE = "(%s::uuid, %s, %s::jsonb, %s)"
+
+EventRow = Tuple[Optional[str], str, str, datetime]
+
+
+class AnalyticsBuffer:
+    """
+    In-memory queue of analytics events drained in batches by a background task.
+
+    Delivery is at-most-once: events still queued when the process dies are lost,
+    and a failed batch is logged and dropped rather than retried.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[EventRow] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background drainer on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._drain())
+        logger.info("Analytics buffer started")
+
+    async def stop(self):
+        """Stop the drainer and flush anything still queued"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        batch, self._pending = self._pending + self._take_batch(self._queue.qsize()), []
+        if batch:
+            await asyncio.to_thread(self._flush, batch)
+        self._task = None
+        logger.info("Analytics buffer stopped")
+
+    def put(self, user_id: Optional[uuid.UUID], event_type: str, event_data: Optional[Dict] = None):
+        """Queue an event; safe to call from the event loop or from worker threads"""
+        row: EventRow = (
+            str(user_id) if user_id else None,
+            event_type,
+            orjson.dumps(event_data or {}).decode(),
+            datetime.now(timezone.utc)
+        )
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._put_nowait(row)
+        else:
+            self._loop.call_soon_threadsafe(self._put_nowait, row)
+
+    def _put_nowait(self, row: EventRow):
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning(f"Analytics buffer full - dropping event: {row[1]}")
+
+    def _take_batch(self, limit: int) -> List[EventRow]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _drain(self):
+        while True:
+            self._pending.append(await self._queue.get())
+            deadline = self._loop.time() + FLUSH_INTERVAL_S
+            while len(self._pending) < FLUSH_BATCH_SIZE:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, []
+            await asyncio.to_thread(self._flush, batch)
+
+    @staticmethod
+    def _flush(batch: List[EventRow]):
+        if not database.engine:
+            return
+        conn = None
+        try:
+            # Inside the try: an unreachable database must drop this batch, not the drainer
+            conn = database.engine.raw_connection()
+            with conn.cursor() as cur:
+                execute_values(cur, _INSERT_SQL, batch, template=_INSERT_TEMPLATE, page_size=FLUSH_BATCH_SIZE)
+            conn.commit()
+        except Exception as e:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+            logger.error(f"Error flushing {len(batch)} analytics events: {str(e)}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+analytics_buffer = AnalyticsBuffer()
@@ -14,6 +14,9 @@ LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.35"))
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 
+# Retriever index cache (hashed question matrix, keyed by CSV content)
+RETRIEVER_CACHE_DIR = Path(os.getenv("RETRIEVER_CACHE_DIR") or Path.home() / ".cache" / "kuapa-ai")
+
 # Google TTS
 GOOGLE_TTS_PROJECT_ID = os.getenv("GOOGLE_TTS_PROJECT_ID", "")
 GOOGLE_TTS_CREDENTIALS_JSON_PATH = os.getenv("GOOGLE_TTS_CREDENTIALS_JSON_PATH", "")
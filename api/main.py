@@ -2,29 +2,39 @@ from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, WebSock
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from typing import Optional, Dict
 from uuid import uuid4
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import tempfile
 import os
 from pathlib import Path
+import orjson
 
 from .logger import logger
 from .config import GEMINI_API_KEY, DATABASE_URL
 from .asr_whisper_api import transcribe_audio
-from .rag import retrieve_context
+from .rag import retrieve_context, warm_retriever
 from .llm import answer
 from .tts_en_google import synthesize_en
 from .database import init_db, close_db, get_db_context
 from .user_service import UserService
+from .analytics import analytics_buffer
 from .language_service import detect_language, translate_to_english
 
 # Constants
 MAX_AUDIO_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_AUDIO_DURATION = 180  # 3 minutes in seconds
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, which encodes UUID and datetime natively"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     if not GEMINI_API_KEY:
@@ -36,6 +46,7 @@ async def lifespan(app: FastAPI):
     if DATABASE_URL:
         if init_db():
             logger.info("Database initialized successfully")
+            analytics_buffer.start()
         else:
             logger.warning("Database initialization failed - running without database")
     else:
@@ -45,9 +56,13 @@ async def lifespan(app: FastAPI):
     media_out.mkdir(parents=True, exist_ok=True)
     logger.info("Media directory initialized")
 
+    await asyncio.to_thread(warm_retriever)
+    logger.info("RAG retriever initialized")
+
     yield
 
     # Cleanup
+    await analytics_buffer.stop()
     close_db()
     logger.info("Kuapa AI shutting down")
 
@@ -55,7 +70,8 @@ app = FastAPI(
     title="Kuapa AI",
     description="Agricultural advisory assistant for farmers",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -65,6 +81,22 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Only wraps HTTP responses; websocket frames pass through untouched.
+# Starlette's default exclusions already skip event streams and audio/*,
+# so generated MP3 replies keep their Range support.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+def _timed_retrieve(query: str):
+    start = time.perf_counter_ns()
+    ctx = retrieve_context(query)
+    return ctx, (time.perf_counter_ns() - start) // 1_000_000
+
+def start_retrieval(query: str) -> asyncio.Future:
+    """
+    Submit RAG retrieval to the default executor so it does not block the
+    event loop. Resolves to (context, rag_ms).
+    """
+    return asyncio.get_running_loop().run_in_executor(None, _timed_retrieve, query)
 
 class ChatRequest(BaseModel):
     message: str
@@ -112,8 +144,8 @@ async def health():
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
-    request_id = str(uuid4())
-    start = time.time()
+    request_id = uuid4().hex
+    start = time.perf_counter_ns()
 
     try:
         # Detect language of incoming message
@@ -144,17 +176,15 @@ async def chat(request: ChatRequest) -> ChatResponse:
                 }
             )
 
-        rag_start = time.time()
-        ctx = retrieve_context(query_for_rag)
-        rag_ms = int((time.time() - rag_start) * 1000)
+        ctx, rag_ms = await start_retrieval(query_for_rag)
         logger.info(f"RAG retrieved {len(ctx)} context chunks", extra={"request_id": request_id})
 
-        llm_start = time.time()
+        llm_start = time.perf_counter_ns()
         # Pass original message and detected language to LLM for natural response
         response_text = await answer(request.message, ctx, language=detected_lang)
-        llm_ms = int((time.time() - llm_start) * 1000)
+        llm_ms = (time.perf_counter_ns() - llm_start) // 1_000_000
 
-        total_ms = int((time.time() - start) * 1000)
+        total_ms = (time.perf_counter_ns() - start) // 1_000_000
 
         # Save to database if phone number provided
         if request.phone_number and DATABASE_URL:
@@ -237,8 +267,8 @@ async def process_voice(
     Languages: English, Twi, Ga, Ewe, Dagbani
     Max size: 10MB
     """
-    request_id = str(uuid4())
-    start = time.time()
+    request_id = uuid4().hex
+    start = time.perf_counter_ns()
     tmp = None
 
     try:
@@ -293,9 +323,9 @@ async def process_voice(
         logger.info(f"Audio file saved temporarily: {tmp.name}", extra={"request_id": request_id})
 
         # Transcribe audio
-        asr_start = time.time()
+        asr_start = time.perf_counter_ns()
         asr_result = await transcribe_audio(tmp.name)
-        asr_ms = int((time.time() - asr_start) * 1000)
+        asr_ms = (time.perf_counter_ns() - asr_start) // 1_000_000
 
         transcribed_text = asr_result.get("text", "").strip()
         detected_language = asr_result.get("language", "en")
@@ -324,7 +354,7 @@ async def process_voice(
                 response="Sorry, I couldn't understand the audio. Please try again or send a text message.",
                 language=detected_language,
                 request_id=request_id,
-                timings_ms={"asr": asr_ms, "total": int((time.time() - start) * 1000)}
+                timings_ms={"asr": asr_ms, "total": (time.perf_counter_ns() - start) // 1_000_000}
             )
 
         logger.info(
@@ -333,18 +363,16 @@ async def process_voice(
         )
 
         # Retrieve context using RAG
-        rag_start = time.time()
-        ctx = retrieve_context(transcribed_text)
-        rag_ms = int((time.time() - rag_start) * 1000)
+        ctx, rag_ms = await start_retrieval(transcribed_text)
         
         logger.info(f"RAG retrieved {len(ctx)} context chunks", extra={"request_id": request_id})
 
         # Generate response using LLM
-        llm_start = time.time()
+        llm_start = time.perf_counter_ns()
         response_text = await answer(transcribed_text, ctx, language=detected_language)
-        llm_ms = int((time.time() - llm_start) * 1000)
+        llm_ms = (time.perf_counter_ns() - llm_start) // 1_000_000
 
-        total_ms = int((time.time() - start) * 1000)
+        total_ms = (time.perf_counter_ns() - start) // 1_000_000
 
         # Save to database if phone number provided
         if phone_number and DATABASE_URL:
@@ -483,12 +511,13 @@ async def list_users(limit: int = 10, offset: int = 0):
             from .models import User
             users = db.query(User).offset(offset).limit(limit).all()
             
-            return {
+            # Returned directly so model rows skip jsonable_encoder
+            return ORJSONResponse({
                 "users": [user.to_dict() for user in users],
                 "count": len(users),
                 "offset": offset,
                 "limit": limit
-            }
+            })
     except Exception as e:
         logger.error(f"Error fetching users: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
@@ -515,10 +544,10 @@ async def get_user(phone_number: str):
             # Get user stats
             stats = UserService.get_user_stats(db, user.id)
             
-            return {
+            return ORJSONResponse({
                 "user": user.to_dict(),
                 "stats": stats
-            }
+            })
     except HTTPException:
         raise
     except Exception as e:
@@ -546,11 +575,11 @@ async def get_user_messages(phone_number: str, limit: int = 20):
             
             messages = UserService.get_conversation_history(db, user.id, limit=limit)
             
-            return {
+            return ORJSONResponse({
                 "phone_number": phone_number,
                 "messages": [msg.to_dict() for msg in messages],
                 "count": len(messages)
-            }
+            })
     except HTTPException:
         raise
     except Exception as e:
@@ -646,6 +675,10 @@ class ConnectionManager:
         if client_id in self.active_connections:
             await self.active_connections[client_id].send_text(message)
 
+    async def send_bytes(self, payload: bytes, client_id: str):
+        if client_id in self.active_connections:
+            await self.active_connections[client_id].send_bytes(payload)
+
 manager = ConnectionManager()
 
 @app.websocket("/ws/{client_id}")
@@ -656,36 +689,33 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
             data = await websocket.receive_text()
             logger.info(f"WebSocket message from {client_id}: {data[:100]}")
 
-            request_id = str(uuid4())
-            start = time.time()
+            request_id = uuid4().hex
+            start = time.perf_counter_ns()
 
             try:
-                rag_start = time.time()
-                ctx = retrieve_context(data)
-                rag_ms = int((time.time() - rag_start) * 1000)
+                ctx, rag_ms = await start_retrieval(data)
 
-                llm_start = time.time()
+                llm_start = time.perf_counter_ns()
                 response_text = await answer(data, ctx)
-                llm_ms = int((time.time() - llm_start) * 1000)
+                llm_ms = (time.perf_counter_ns() - llm_start) // 1_000_000
 
-                total_ms = int((time.time() - start) * 1000)
+                total_ms = (time.perf_counter_ns() - start) // 1_000_000
 
-                import json
-                response = json.dumps({
+                response = orjson.dumps({
                     "response": response_text,
                     "request_id": request_id,
                     "timings_ms": {"rag": rag_ms, "llm": llm_ms, "total": total_ms}
                 })
 
-                await manager.send_message(response, client_id)
+                await manager.send_bytes(response, client_id)
 
             except Exception as e:
                 logger.error(f"Error in WebSocket processing: {str(e)}", exc_info=True)
-                error_response = json.dumps({
+                error_response = orjson.dumps({
                     "error": str(e),
                     "request_id": request_id
                 })
-                await manager.send_message(error_response, client_id)
+                await manager.send_bytes(error_response, client_id)
 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
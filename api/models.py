@@ -3,7 +3,7 @@ SQLAlchemy models for Kuapa AI database
 Maps to PostgreSQL tables with pgVector support
 """
 
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Text, ARRAY, ForeignKey, Float
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Text, ARRAY, ForeignKey, Float, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,6 +13,13 @@ from datetime import datetime
 
 from .database import Base
 
+def model_to_payload(obj, fields) -> dict:
+    """
+    Collect raw attribute values for serialization.
+    UUID and datetime values are left as-is for orjson to encode natively.
+    """
+    return {name: getattr(obj, name) for name in fields}
+
 class User(Base):
     """User model - stores farmer profiles"""
     __tablename__ = "users"
@@ -39,19 +46,12 @@ class User(Base):
     def __repr__(self):
         return f"<User(phone={self.phone_number}, name={self.name})>"
     
+    _payload_fields = (
+        'id', 'phone_number', 'name', 'preferred_language', 'location', 'farm_size', 'crops', 'created_at', 'last_active_at', 'is_active'
+    )
+    
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "phone_number": self.phone_number,
-            "name": self.name,
-            "preferred_language": self.preferred_language,
-            "location": self.location,
-            "farm_size": self.farm_size,
-            "crops": self.crops,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_active_at": self.last_active_at.isoformat() if self.last_active_at else None,
-            "is_active": self.is_active
-        }
+        return model_to_payload(self, self._payload_fields)
 
 class Conversation(Base):
     """Conversation model - groups messages into sessions"""
@@ -70,18 +70,18 @@ class Conversation(Base):
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
     sessions = relationship("Session", back_populates="conversation", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        # Partial index for UserService.get_or_create_conversation (active only, newest first)
+        Index('idx_conversations_user_active_started', 'user_id', 'started_at', postgresql_where=text('is_active')),
+    )
+    
     def __repr__(self):
         return f"<Conversation(id={self.id}, user_id={self.user_id}, messages={self.message_count})>"
     
+    _payload_fields = ('id', 'user_id', 'started_at', 'ended_at', 'message_count', 'is_active')
+    
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "ended_at": self.ended_at.isoformat() if self.ended_at else None,
-            "message_count": self.message_count,
-            "is_active": self.is_active
-        }
+        return model_to_payload(self, self._payload_fields)
 
 class Message(Base):
     """Message model - stores individual chat messages with embeddings"""
@@ -104,21 +104,20 @@ class Message(Base):
     conversation = relationship("Conversation", back_populates="messages")
     user = relationship("User", back_populates="messages")
     
+    __table_args__ = (
+        # Serves per-user history (ORDER BY created_at) and the user_id prefix of the stats query
+        Index('idx_messages_user', 'user_id', 'created_at'),
+    )
+    
     def __repr__(self):
         return f"<Message(id={self.id}, type={self.message_type}, direction={self.direction})>"
     
+    _payload_fields = (
+        'id', 'conversation_id', 'user_id', 'message_type', 'direction', 'content', 'transcribed_text', 'language', 'created_at'
+    )
+    
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "conversation_id": str(self.conversation_id),
-            "user_id": str(self.user_id),
-            "message_type": self.message_type,
-            "direction": self.direction,
-            "content": self.content,
-            "transcribed_text": self.transcribed_text,
-            "language": self.language,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        return model_to_payload(self, self._payload_fields)
 
 class Session(Base):
     """Session model - tracks active WhatsApp sessions"""
@@ -141,15 +140,12 @@ class Session(Base):
     def __repr__(self):
         return f"<Session(id={self.id}, user_id={self.user_id}, active={self.is_active})>"
     
+    _payload_fields = (
+        'id', 'user_id', 'conversation_id', 'started_at', 'last_activity_at', 'is_active'
+    )
+    
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id),
-            "conversation_id": str(self.conversation_id) if self.conversation_id else None,
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "last_activity_at": self.last_activity_at.isoformat() if self.last_activity_at else None,
-            "is_active": self.is_active
-        }
+        return model_to_payload(self, self._payload_fields)
 
 class UserPreference(Base):
     """User preferences model"""
@@ -183,11 +179,7 @@ class Analytics(Base):
     def __repr__(self):
         return f"<Analytics(event={self.event_type}, user_id={self.user_id})>"
     
+    _payload_fields = ('id', 'user_id', 'event_type', 'event_data', 'created_at')
+    
     def to_dict(self):
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id) if self.user_id else None,
-            "event_type": self.event_type,
-            "event_data": self.event_data,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+        return model_to_payload(self, self._payload_fields)
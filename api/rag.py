@@ -1,14 +1,25 @@
+import threading
 from typing import List, Tuple
 from .utils_fallback_retriever import FallbackRetriever
+from ._retriever_kernels import warm_kernels
 
 _retriever = None
+_retriever_lock = threading.Lock()
 
 def _get_retriever():
     global _retriever
     if _retriever is None:
-        _retriever = FallbackRetriever()
+        # Retrieval runs on executor threads; build the index only once
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = FallbackRetriever()
     return _retriever
 
+def warm_retriever():
+    """Build the retriever index and compile its scoring kernel ahead of the first request"""
+    _get_retriever()
+    warm_kernels()
+
 def retrieve_context(query: str) -> List[Tuple[str, float, str]]:
     r = _get_retriever()
     return r.search(query)
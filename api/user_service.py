@@ -3,13 +3,14 @@ User service for managing user profiles, conversations, and messages
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 import uuid
 
 from .models import User, Conversation, Message, Session as DBSession, Analytics
 from .logger import logger
+from .analytics import analytics_buffer
 
 class UserService:
     """Service for managing users and their interactions"""
@@ -188,7 +189,10 @@ class UserService:
         event_type: str,
         event_data: Optional[Dict] = None
     ):
-        """Log an analytics event"""
+        """Log an analytics event (buffered when the background writer is running)"""
+        if analytics_buffer.running:
+            analytics_buffer.put(user_id, event_type, event_data)
+            return
         try:
             event = Analytics(
                 user_id=user_id,
@@ -213,15 +217,11 @@ class UserService:
                 Conversation.user_id == user_id
             ).count()
             
-            total_messages = db.query(Message).filter(
-                Message.user_id == user_id,
-                Message.direction == 'incoming'
-            ).count()
-            
-            voice_messages = db.query(Message).filter(
-                Message.user_id == user_id,
-                Message.message_type == 'voice'
-            ).count()
+            # Both message counts in a single round-trip
+            total_messages, voice_messages = db.query(
+                func.count(Message.id).filter(Message.direction == 'incoming'),
+                func.count(Message.id).filter(Message.message_type == 'voice')
+            ).filter(Message.user_id == user_id).one()
             
             return {
                 "user_id": str(user_id),
@@ -1,39 +1,352 @@
 import os
+import shutil
+import hashlib
+import functools
+import tempfile
+import threading
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ._retriever_kernels import sparse_scores
+from .config import RETRIEVER_CACHE_DIR
+from .logger import logger
+
+try:
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+CSV_COLUMNS = ['question', 'answer', 'source']
+DEFAULT_SOURCE = 'csv:agriculture_qna_expanded'
+HASH_FEATURES = 2 ** 18
+QUERY_CACHE_SIZE = 1024
+RESULT_CACHE_SIZE = 512
+# Queries with at most this many distinct terms are scored from the postings
+POSTINGS_MAX_TERMS = 3
+
+
+def _read_qna_csv(csv_path: Path) -> pd.DataFrame:
+    """Load only the Q&A columns, parsed by pyarrow when it is installed"""
+    if _HAS_PYARROW:
+        # open_csv only parses the first block, enough to see which columns exist
+        present = [c for c in CSV_COLUMNS if c in pacsv.open_csv(csv_path).schema.names]
+        table = pacsv.read_csv(csv_path, convert_options=pacsv.ConvertOptions(include_columns=present))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return pd.read_csv(csv_path, usecols=lambda c: c in CSV_COLUMNS)
+
+_CSR_ARRAYS = ('data', 'indices', 'indptr')
+# Bumped whenever the files in a cache directory change
+_CACHE_FORMAT = 2
+
+
+def _load_csr(path: Path, prefix: str = "") -> sp.csr_matrix:
+    data, indices, indptr = (np.load(path / f"{prefix}{part}.npy", mmap_mode='r') for part in _CSR_ARRAYS)
+    shape = tuple(int(n) for n in np.load(path / f"{prefix}shape.npy"))
+    return sp.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def _save_csr(path: Path, matrix: sp.csr_matrix, prefix: str = ""):
+    for part in _CSR_ARRAYS:
+        np.save(path / f"{prefix}{part}.npy", np.ascontiguousarray(getattr(matrix, part)))
+    np.save(path / f"{prefix}shape.npy", np.asarray(matrix.shape, dtype=np.int64))
+
+
+def _load_cached_matrix(path: Path) -> Optional[Tuple[sp.csr_matrix, sp.csr_matrix, np.ndarray]]:
+    """
+    Memory-map a cached CSR matrix and its postings read-only, so every worker
+    process on the host shares the same page-cache copy instead of holding its
+    own, and load the IDF weights they were built with
+    """
+    try:
+        idf = np.load(path / "idf.npy")
+        return _load_csr(path), _load_csr(path, "postings_"), idf
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable retriever cache {path}: {str(e)}")
+        return None
+
+
+def _store_cached_matrix(path: Path, matrix: sp.csr_matrix, postings: sp.csr_matrix, idf: np.ndarray):
+    """Build the cache in a temp directory and rename it into place, so a reader never sees a partial one"""
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+        _save_csr(tmp, matrix)
+        _save_csr(tmp, postings, "postings_")
+        np.save(tmp / "idf.npy", idf)
+        os.replace(tmp, path)
+        tmp = None
+        _prune_stale_caches(path)
+    except OSError as e:
+        # Includes losing the rename race to another worker that built the same cache
+        if not path.exists():
+            logger.warning(f"Could not write retriever cache {path}: {str(e)}")
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+def _prune_stale_caches(path: Path):
+    """
+    Delete indexes built from earlier CSV versions; each edit of the CSV
+    otherwise leaves another full copy behind. Workers still mapping an old
+    one keep their open files; only the directory entries go away.
+    """
+    for entry in path.parent.glob("retriever_*"):
+        if entry != path:
+            shutil.rmtree(entry, ignore_errors=True)
 
 class FallbackRetriever:
     def __init__(self):
+        # Per-thread scoring buffers; search() is called from executor threads
+        self._local = threading.local()
+        self._add_lock = threading.Lock()
+        # Stateless: no vocabulary to fit, so rows can be added without a rebuild.
+        # Raw counts here; IDF weighting and L2 normalization happen in the transformer.
+        self.vectorizer = HashingVectorizer(
+            n_features=HASH_FEATURES,
+            alternate_sign=False,
+            norm=None,
+            stop_words='english',
+            dtype=np.float32
+        )
+        self.transformer = TfidfTransformer(norm='l2', smooth_idf=True)
+        # Chat traffic repeats questions; reuse their hashed vectors
+        self._vectorize_query = functools.lru_cache(maxsize=QUERY_CACHE_SIZE)(self._transform_query)
+        # Whole ranked answers for repeated (query, k); keyed on the corpus size,
+        # which only grows, so results from before add_rows() are never served
+        self._ranked = functools.lru_cache(maxsize=RESULT_CACHE_SIZE)(self._rank)
         project_root = Path(__file__).resolve().parents[1]
         csv_path = project_root / "data" / "agriculture_qna_expanded.csv"
         if not csv_path.exists():
             self.df = pd.DataFrame({"question": [], "answer": [], "source": []})
-            self.vectorizer = TfidfVectorizer(stop_words='english')
-            self.matrix = self.vectorizer.fit_transform(["placeholder question"])
+            self.matrix = sp.csr_matrix((0, HASH_FEATURES), dtype=np.float32)
+            self._postings = (self.matrix.T.tocsr(), self.matrix)
+            # What a smoothed fit over zero documents would give
+            self.transformer.idf_ = np.ones(HASH_FEATURES, dtype=np.float32)
+            self._answers = np.empty(0, dtype=object)
+            self._sources = np.empty(0, dtype=object)
             return
-        self.df = pd.read_csv(csv_path)
+        self.df = _read_qna_csv(csv_path)
         if 'question' not in self.df.columns or 'answer' not in self.df.columns:
             raise ValueError("Dataset must have 'question' and 'answer' columns")
         if 'source' not in self.df.columns:
-            self.df['source'] = 'csv:agriculture_qna_expanded'
-        self.vectorizer = TfidfVectorizer(stop_words='english')
-        self.matrix = self.vectorizer.fit_transform(self.df['question'].astype(str))
+            self.df['source'] = DEFAULT_SOURCE
+        self.matrix, postings = self._build_matrix(csv_path)
+        # Postings plus the rows add_rows() appended after them, published
+        # together so a reader never counts a row twice
+        self._postings = (postings, sp.csr_matrix((0, HASH_FEATURES), dtype=np.float32))
+        # Plain object arrays keep label-based .loc lookups out of search()
+        self._answers = self.df['answer'].astype(str).to_numpy(dtype=object)
+        self._sources = self.df['source'].astype(str).to_numpy(dtype=object)
+
+    def _build_matrix(self, csv_path: Path) -> Tuple[sp.csr_matrix, sp.csr_matrix]:
+        """
+        Hash and IDF-weight the questions into the row matrix and its
+        feature -> (rows, weights) postings, reusing the on-disk index and IDF
+        when the CSV, vectorizer and transformer are unchanged
+        """
+        key = hashlib.sha1(csv_path.read_bytes())
+        key.update(f":{_CACHE_FORMAT}".encode())
+        key.update(f"{sklearn.__version__}:{sorted(self.vectorizer.get_params().items())}".encode())
+        key.update(f":{sorted(self.transformer.get_params().items())}".encode())
+        cache_path = RETRIEVER_CACHE_DIR / f"retriever_{key.hexdigest()}"
+        cached = _load_cached_matrix(cache_path)
+        if cached is not None and cached[0].shape[0] == len(self.df):
+            matrix, postings, self.transformer.idf_ = cached
+            return matrix, postings
+        matrix = self.transformer.fit_transform(self.vectorizer.transform(self.df['question'].astype(str)))
+        postings = matrix.T.tocsr()
+        _store_cached_matrix(cache_path, matrix, postings, self.transformer.idf_)
+        return matrix, postings
 
     def search(self, query: str, k: int = 8) -> List[Tuple[str, float, str]]:
-        if not query:
+        normalized = self._normalize(query)
+        # Nothing to match; skip the transform and the corpus scan
+        if not normalized:
             return []
-        query_vec = self.vectorizer.transform([query])
-        similarities = cosine_similarity(query_vec, self.matrix).flatten()
-        top_idx = similarities.argsort()[::-1][:k]
-        results: List[Tuple[str, float, str]] = []
-        for idx in top_idx:
-            score = float(similarities[idx])
-            chunk = str(self.df.loc[idx, 'answer'])
-            source = str(self.df.loc[idx, 'source'])
-            results.append((chunk, score, source))
+        # Copy so callers can modify the list without touching the cached tuple
+        return list(self._ranked(normalized, k, self.matrix.shape[0]))
+
+    def _rank(self, normalized: str, k: int, n_rows: int) -> Tuple[Tuple[str, float, str], ...]:
+        """Score a normalized query against the corpus; n_rows only keys the result cache"""
+        indices, values = self._vectorize_query(normalized)
+        if 0 < indices.shape[0] <= POSTINGS_MAX_TERMS:
+            ranked = self._rank_postings(indices, values, k)
+            if ranked is not None:
+                return ranked
+        # Rows and the query are L2-normalized, so cosine is a plain dot product.
+        # Snapshot the matrix: add_rows() may swap in a longer one concurrently.
+        matrix = self.matrix
+        q, scores = self._buffers(matrix.shape[0])
+        # q stays all-zero between calls: only the query's own features are set
+        # and cleared again, instead of rewriting all HASH_FEATURES entries
+        q[indices] = values
+        try:
+            similarities = sparse_scores(matrix, q, scores)
+        finally:
+            q[indices] = 0.0
+        top_idx = self._top_k(similarities, k)
+        return tuple((self._answers[i], float(similarities[i]), self._sources[i]) for i in top_idx)
+
+    def _rank_postings(
+        self, indices: np.ndarray, values: np.ndarray, k: int
+    ) -> Optional[Tuple[Tuple[str, float, str], ...]]:
+        """
+        Score only the rows sharing a term with a short query, walking the
+        postings instead of the whole corpus. Same weights and the same
+        row-index tie-break as the full scan, so the ranking matches it;
+        returns None when the full scan is needed.
+        """
+        postings, appended = self._postings
+        n_base = postings.shape[1]
+        starts, ends = postings.indptr[indices], postings.indptr[indices + 1]
+        # Common terms touch most rows; then sorting the postings costs more
+        # than the scan, and with fewer than k candidates the full scan would
+        # pad the results with zero-score rows
+        if int((ends - starts).sum()) > (n_base + appended.shape[0]) // 2:
+            return None
+        rows = np.concatenate([postings.indices[s:e] for s, e in zip(starts, ends)])
+        weights = np.concatenate([postings.data[s:e] * v for s, e, v in zip(starts, ends, values)])
+        if appended.shape[0]:
+            # Rows added since the postings were built are few; score them directly
+            tail = appended[:, indices] @ values
+            hit = np.flatnonzero(tail)
+            rows = np.concatenate([rows, hit + n_base])
+            weights = np.concatenate([weights, tail[hit]])
+        candidates, slot = np.unique(rows, return_inverse=True)
+        if candidates.shape[0] < k:
+            return None
+        scores = np.bincount(slot, weights=weights).astype(np.float32)
+        best = self._top_k(scores, k)
+        return tuple(
+            (self._answers[i], float(s), self._sources[i]) for i, s in zip(candidates[best], scores[best])
+        )
+
+    def search_batch(self, queries: Sequence[str], k: int = 8) -> List[List[Tuple[str, float, str]]]:
+        """Run several queries in one pass over the corpus, one result list per query"""
+        normalized = [self._normalize(query) for query in queries]
+        matrix, answers, sources = self.matrix, self._answers, self._sources
+        vectors = [self._vectorize_query(n) if n else (np.empty(0, np.int32), np.empty(0, np.float32))
+                   for n in normalized]
+        indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices, _ in vectors], out=indptr[1:])
+        Q = sp.csr_matrix(
+            (np.concatenate([v for _, v in vectors] or [np.empty(0, np.float32)]),
+             np.concatenate([i for i, _ in vectors] or [np.empty(0, np.int32)]),
+             indptr),
+            shape=(len(vectors), matrix.shape[1])
+        )
+        # One sparse product reads each corpus row once for the whole batch
+        # instead of once per query; row b holds the scores of query b
+        S = (Q @ matrix.T).toarray()
+        results: List[List[Tuple[str, float, str]]] = []
+        for b, n in enumerate(normalized):
+            if not n:
+                results.append([])
+                continue
+            top_idx = self._top_k(S[b], k)
+            results.append([(answers[i], float(S[b, i]), sources[i]) for i in top_idx])
         return results
 
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters of the query vector and result caches"""
+        return {
+            "query_cache": self._vectorize_query.cache_info()._asdict(),
+            "result_cache": self._ranked.cache_info()._asdict()
+        }
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        # The vectorizer lowercases and splits on non-word characters, so this
+        # normalization only merges queries that would hash identically
+        return ' '.join(query.lower().split()) if query else ''
+
+    def _transform_query(self, normalized: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted feature indices and values of a query; read-only since they are cached"""
+        query_vec = self._embed([normalized])
+        indices, values = query_vec.indices, query_vec.data
+        indices.flags.writeable = False
+        values.flags.writeable = False
+        return indices, values
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores, best first; equal scores by lower index"""
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        if k >= scores.shape[0]:
+            return np.argsort(-scores, kind='stable')
+        # O(N) selection, then sort only the k winners. argpartition picks
+        # arbitrarily among rows tied with the k-th score, so re-select those
+        # by index; both parts are in index order for the stable sort.
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:k - above.shape[0]]
+        top = np.concatenate([above, tied])
+        return top[np.argsort(-scores[top], kind='stable')]
+
+    def _embed(self, texts: Sequence[str]) -> sp.csr_matrix:
+        """Hashed counts, IDF-weighted and L2-normalized like the corpus rows"""
+        return self.transformer.transform(self.vectorizer.transform(texts))
+
+    def add_rows(
+        self,
+        questions: Sequence[str],
+        answers: Sequence[str],
+        sources: Optional[Sequence[str]] = None
+    ):
+        """
+        Append Q&A rows to the live index without refitting; new rows are
+        weighted with the IDF fitted on the startup corpus
+
+        Args:
+            questions: Questions to index
+            answers: Answers returned for each question
+            sources: Source labels (defaults to the CSV source label)
+        """
+        if len(questions) != len(answers):
+            raise ValueError("questions and answers must have the same length")
+        if not len(questions):
+            return
+        if sources is None:
+            sources = [DEFAULT_SOURCE] * len(questions)
+        elif len(sources) != len(questions):
+            raise ValueError("sources must have the same length as questions")
+        questions = [str(q) for q in questions]
+        new_rows = self._embed(questions)
+        added = pd.DataFrame({'question': questions, 'answer': list(answers), 'source': list(sources)})
+        with self._add_lock:
+            self.df = pd.concat([self.df, added], ignore_index=True)
+            # Grow the lookup arrays before publishing the matrix, so any row a
+            # concurrent search() can see already has its answer and source
+            self._answers = np.concatenate([self._answers, np.asarray(answers, dtype=object)])
+            self._sources = np.concatenate([self._sources, np.asarray(sources, dtype=object)])
+            matrix = sp.vstack([self.matrix, new_rows], format='csr')
+            postings, appended = self._postings
+            appended = sp.vstack([appended, new_rows], format='csr')
+            # Fold the appended rows into the postings only once they reach a
+            # quarter of its size, so the transpose is paid for amortized
+            if appended.nnz > postings.nnz // 4:
+                postings, appended = matrix.T.tocsr(), appended[:0]
+            # Postings before the matrix: a row id the postings path can reach
+            # must already have its answer
+            self._postings = (postings, appended)
+            self.matrix = matrix
+        # Stale entries could never be hit again; drop them to free the slots
+        self._ranked.cache_clear()
 
+    def _buffers(self, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return this thread's dense query and score buffers, allocating on first use"""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None or buffers[1].shape[0] != n_rows:
+            buffers = (np.zeros(self.matrix.shape[1], dtype=np.float32), np.empty(n_rows, dtype=np.float32))
+            self._local.buffers = buffers
+        return buffers
@@ -6,16 +6,116 @@ Verifies all dependencies and configurations before starting the application
 
 import sys
 import os
+import io
+import shutil
+import functools
+import hashlib
+import json
+import re
+import time
+import importlib.util
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from dotenv import dotenv_values
+    _HAS_DOTENV = True
+except ImportError:
+    _HAS_DOTENV = False
 
 # ANSI color codes
-GREEN = '\033[92m'
-RED = '\033[91m'
-YELLOW = '\033[93m'
-BLUE = '\033[94m'
-RESET = '\033[0m'
+# Escape codes are only emitted when writing to a terminal
+_USE_COLOR = sys.stdout.isatty()
+GREEN = '\033[92m' if _USE_COLOR else ''
+RED = '\033[91m' if _USE_COLOR else ''
+YELLOW = '\033[93m' if _USE_COLOR else ''
+BLUE = '\033[94m' if _USE_COLOR else ''
+RESET = '\033[0m' if _USE_COLOR else ''
+
+_OK_PREFIX = f"{GREEN}✓{RESET} "
+_ERROR_PREFIX = f"{RED}✗{RESET} "
+_WARNING_PREFIX = f"{YELLOW}⚠{RESET} "
+_INFO_PREFIX = f"{BLUE}ℹ{RESET} "
+
+MAX_CHECK_WORKERS = 8
+VERSION_PROBE_TIMEOUT = 2
+
+# A successful run is remembered for a day while nothing it inspects has changed
+CACHE_PATH = Path.home() / ".cache" / "kuapa-ai" / "system_check.json"
+CACHE_TTL_S = 24 * 60 * 60
+
+# Version output of external tools keyed by (absolute path, mtime)
+_version_cache: Dict[Tuple[str, float], str] = {}
+
+# Checks run on worker threads; each one prints into its own buffer so the
+# report is written in declaration order once the check finishes
+_output = threading.local()
+
+def _emit(text: str = ""):
+    print(text, file=getattr(_output, 'stream', None) or sys.stdout)
+
+@functools.lru_cache(maxsize=None)
+def _resolve_binary(name: str) -> Optional[str]:
+    """Locate an executable on PATH without spawning it"""
+    return shutil.which(name)
+
+def _binary_version(path: str, flag: str) -> str:
+    """Run `path flag` once per binary build and return its stdout"""
+    key = (path, os.stat(path).st_mtime)
+    if key not in _version_cache:
+        # Only stdout is read, so a single pipe is drained without a select loop
+        result = subprocess.run(
+            [path, flag],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=VERSION_PROBE_TIMEOUT,
+            stdin=subprocess.DEVNULL,
+            check=True
+        )
+        _version_cache[key] = result.stdout
+    return _version_cache[key]
+
+def _load_env(path: Path) -> Optional[Dict[str, Optional[str]]]:
+    """Parse a .env file once into a dict, or None if it does not exist"""
+    if not path.exists():
+        return None
+    if _HAS_DOTENV:
+        return dotenv_values(path)
+    # python-dotenv may not be installed yet when the preflight runs
+    env = {}
+    for line in path.read_text().splitlines():
+        if '=' in line and not line.lstrip().startswith('#'):
+            key, value = line.split('=', 1)
+            env[key.strip()] = value.strip()
+    return env
+
+def _normalize_dist_name(name: str) -> str:
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def _installed_distributions() -> Dict[str, str]:
+    """
+    Map normalized distribution name to version, from one directory listing per
+    sys.path entry; dist-info directory names carry both, so no METADATA is read
+    """
+    dists = {}
+    for entry in sys.path:
+        try:
+            with os.scandir(entry or '.') as it:
+                names = [e.name for e in it]
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext in ('.dist-info', '.egg-info') and '-' in stem:
+                dist, version = stem.split('-', 1)
+                # First match wins, as it does for the import system
+                dists.setdefault(_normalize_dist_name(dist), version.split('-')[0])
+    return dists
 
 def print_header(text: str):
     print(f"\n{BLUE}{'=' * 60}{RESET}")
@@ -23,16 +123,25 @@ def print_header(text: str):
     print(f"{BLUE}{'=' * 60}{RESET}\n")
 
 def print_success(text: str):
-    print(f"{GREEN}✓{RESET} {text}")
+    _emit(_OK_PREFIX + text)
 
 def print_error(text: str):
-    print(f"{RED}✗{RESET} {text}")
+    _emit(_ERROR_PREFIX + text)
 
 def print_warning(text: str):
-    print(f"{YELLOW}⚠{RESET} {text}")
+    _emit(_WARNING_PREFIX + text)
 
 def print_info(text: str):
-    print(f"{BLUE}ℹ{RESET} {text}")
+    _emit(_INFO_PREFIX + text)
+
+@dataclass
+class CheckResult:
+    """Tallies and console output of a single check run on a worker thread"""
+    output: io.StringIO = field(default_factory=io.StringIO)
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    checks_passed: int = 0
+    checks_failed: int = 0
 
 class DependencyChecker:
     def __init__(self):
@@ -40,6 +149,36 @@ class DependencyChecker:
         self.warnings = []
         self.checks_passed = 0
         self.checks_failed = 0
+        self._local = threading.local()
+        self._env = _load_env(Path(".env"))
+        self._dists = _installed_distributions()
+
+    @property
+    def _results(self):
+        """Where the running check records into: its CheckResult when run concurrently, else self"""
+        return getattr(self._local, 'result', None) or self
+
+    def _run_check(self, check: Callable[..., bool], *args) -> CheckResult:
+        """Run one check with its output and tallies captured in a CheckResult"""
+        result = CheckResult()
+        self._local.result = result
+        _output.stream = result.output
+        try:
+            check(*args)
+        except Exception as e:
+            print_error(f"{getattr(check, '__name__', 'check')} crashed: {e}")
+            result.checks_failed += 1
+        finally:
+            self._local.result = None
+            _output.stream = None
+        return result
+
+    def _merge(self, result: CheckResult):
+        sys.stdout.write(result.output.getvalue())
+        self.errors.extend(result.errors)
+        self.warnings.extend(result.warnings)
+        self.checks_passed += result.checks_passed
+        self.checks_failed += result.checks_failed
 
     def check_python_version(self) -> bool:
         """Check if Python version is 3.10+"""
@@ -47,119 +186,109 @@ class DependencyChecker:
         version = sys.version_info
         if version.major == 3 and version.minor >= 10:
             print_success(f"Python {version.major}.{version.minor}.{version.micro} ✓")
-            self.checks_passed += 1
+            self._results.checks_passed += 1
             return True
         else:
             print_error(f"Python {version.major}.{version.minor} found. Need Python 3.10+")
-            self.errors.append("Python version must be 3.10 or higher")
-            self.checks_failed += 1
+            self._results.errors.append("Python version must be 3.10 or higher")
+            self._results.checks_failed += 1
             return False
 
     def check_python_package(self, package: str, import_name: str = None) -> bool:
         """Check if a Python package is installed"""
         import_name = import_name or package
-        try:
-            __import__(import_name)
-            print_success(f"{package} is installed")
-            self.checks_passed += 1
+        version = self._dists.get(_normalize_dist_name(package))
+        if version is not None:
+            found = True
+        else:
+            # Not in the snapshot (e.g. a legacy develop install); ask the import
+            # finders, which never execute the module
+            try:
+                found = importlib.util.find_spec(import_name) is not None
+            except ImportError:
+                found = False
+        if found:
+            version = f" {version}" if version else ""
+            print_success(f"{package}{version} is installed")
+            self._results.checks_passed += 1
             return True
-        except ImportError:
+        else:
             print_error(f"{package} is NOT installed")
-            self.errors.append(f"Install {package}: pip install {package}")
-            self.checks_failed += 1
+            self._results.errors.append(f"Install {package}: pip install {package}")
+            self._results.checks_failed += 1
             return False
 
     def check_ffmpeg(self) -> bool:
         """Check if FFmpeg is installed"""
         print_info("Checking FFmpeg...")
-        try:
-            result = subprocess.run(
-                ['ffmpeg', '-version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                version_line = result.stdout.split('\n')[0]
-                print_success(f"FFmpeg is installed: {version_line}")
-                self.checks_passed += 1
-                return True
-        except FileNotFoundError:
+        ffmpeg = _resolve_binary('ffmpeg')
+        if not ffmpeg:
             print_error("FFmpeg is NOT installed")
-            self.errors.append("Install FFmpeg - See: https://ffmpeg.org/download.html")
-            self.checks_failed += 1
+            self._results.errors.append("Install FFmpeg - See: https://ffmpeg.org/download.html")
+            self._results.checks_failed += 1
             return False
+        try:
+            version_line = _binary_version(ffmpeg, '-version').split('\n')[0]
+            print_success(f"FFmpeg is installed: {version_line}")
+            self._results.checks_passed += 1
+            return True
         except Exception as e:
             print_error(f"Error checking FFmpeg: {e}")
-            self.errors.append("FFmpeg check failed")
-            self.checks_failed += 1
+            self._results.errors.append("FFmpeg check failed")
+            self._results.checks_failed += 1
             return False
 
     def check_node_version(self) -> bool:
         """Check if Node.js is installed"""
         print_info("Checking Node.js...")
-        try:
-            result = subprocess.run(
-                ['node', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                major_version = int(version.replace('v', '').split('.')[0])
-                if major_version >= 18:
-                    print_success(f"Node.js {version} ✓")
-                    self.checks_passed += 1
-                    return True
-                else:
-                    print_error(f"Node.js {version} found. Need v18+")
-                    self.errors.append("Upgrade Node.js to version 18 or higher")
-                    self.checks_failed += 1
-                    return False
-        except FileNotFoundError:
+        node = _resolve_binary('node')
+        if not node:
             print_error("Node.js is NOT installed")
-            self.errors.append("Install Node.js 18+ - See: https://nodejs.org/")
-            self.checks_failed += 1
+            self._results.errors.append("Install Node.js 18+ - See: https://nodejs.org/")
+            self._results.checks_failed += 1
             return False
+        try:
+            version = _binary_version(node, '--version').strip()
+            major_version = int(version.replace('v', '').split('.')[0])
+            if major_version >= 18:
+                print_success(f"Node.js {version} ✓")
+                self._results.checks_passed += 1
+                return True
+            else:
+                print_error(f"Node.js {version} found. Need v18+")
+                self._results.errors.append("Upgrade Node.js to version 18 or higher")
+                self._results.checks_failed += 1
+                return False
         except Exception as e:
             print_error(f"Error checking Node.js: {e}")
-            self.checks_failed += 1
+            self._results.checks_failed += 1
             return False
 
     def check_env_file(self) -> bool:
         """Check if .env file exists and has required variables"""
         print_info("Checking .env configuration...")
-        env_file = Path(".env")
-        
-        if not env_file.exists():
+        if self._env is None:
             print_error(".env file NOT found")
-            self.errors.append("Create .env file: cp .env.example .env")
-            self.checks_failed += 1
+            self._results.errors.append("Create .env file: cp .env.example .env")
+            self._results.checks_failed += 1
             return False
         
-        # Read .env file
-        env_content = env_file.read_text()
-        
         # Check for GEMINI_API_KEY
-        if "GEMINI_API_KEY=" in env_content:
-            # Extract the key value
-            for line in env_content.split('\n'):
-                if line.startswith('GEMINI_API_KEY='):
-                    key_value = line.split('=', 1)[1].strip()
-                    if key_value and key_value != 'your_gemini_api_key_here':
-                        print_success("GEMINI_API_KEY is configured")
-                        self.checks_passed += 1
-                        return True
-                    else:
-                        print_error("GEMINI_API_KEY is empty or not set")
-                        self.errors.append("Set your Gemini API key in .env file")
-                        self.checks_failed += 1
-                        return False
+        if "GEMINI_API_KEY" in self._env:
+            key_value = (self._env["GEMINI_API_KEY"] or "").strip()
+            if key_value and key_value != 'your_gemini_api_key_here':
+                print_success("GEMINI_API_KEY is configured")
+                self._results.checks_passed += 1
+                return True
+            else:
+                print_error("GEMINI_API_KEY is empty or not set")
+                self._results.errors.append("Set your Gemini API key in .env file")
+                self._results.checks_failed += 1
+                return False
         else:
             print_error("GEMINI_API_KEY not found in .env")
-            self.errors.append("Add GEMINI_API_KEY to .env file")
-            self.checks_failed += 1
+            self._results.errors.append("Add GEMINI_API_KEY to .env file")
+            self._results.checks_failed += 1
             return False
 
     def check_whatsapp_node_modules(self) -> bool:
@@ -167,30 +296,36 @@ class DependencyChecker:
         print_info("Checking WhatsApp bot dependencies...")
         node_modules = Path("whatsapp-bot/node_modules")
         
-        if node_modules.exists():
+        # One directory listing instead of an exists() probe per package
+        try:
+            with os.scandir(node_modules) as entries:
+                present = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            present = None
+        
+        if present is not None:
             # Check for specific packages
             required_packages = ['whatsapp-web.js', 'axios', 'form-data']
             all_found = True
             
             for package in required_packages:
-                package_path = node_modules / package
-                if package_path.exists():
+                if package in present:
                     print_success(f"  {package} ✓")
                 else:
                     print_error(f"  {package} NOT found")
                     all_found = False
             
             if all_found:
-                self.checks_passed += 1
+                self._results.checks_passed += 1
                 return True
             else:
-                self.warnings.append("Run: cd whatsapp-bot && npm install")
-                self.checks_failed += 1
+                self._results.warnings.append("Run: cd whatsapp-bot && npm install")
+                self._results.checks_failed += 1
                 return False
         else:
             print_error("node_modules not found")
-            self.errors.append("Install WhatsApp bot dependencies: cd whatsapp-bot && npm install")
-            self.checks_failed += 1
+            self._results.errors.append("Install WhatsApp bot dependencies: cd whatsapp-bot && npm install")
+            self._results.checks_failed += 1
             return False
 
     def check_data_files(self) -> bool:
@@ -200,11 +335,11 @@ class DependencyChecker:
         
         if data_file.exists():
             print_success(f"Knowledge base found: {data_file}")
-            self.checks_passed += 1
+            self._results.checks_passed += 1
             return True
         else:
             print_warning(f"Knowledge base not found: {data_file}")
-            self.warnings.append("Knowledge base file missing - app may have limited responses")
+            self._results.warnings.append("Knowledge base file missing - app may have limited responses")
             return False
 
     def run_all_checks(self):
@@ -213,35 +348,39 @@ class DependencyChecker:
         
         print_info("Starting pre-flight checks...\n")
         
-        # System requirements
-        print(f"\n{BLUE}[1/7] System Requirements{RESET}")
-        self.check_python_version()
-        self.check_node_version()
-        self.check_ffmpeg()
-        
-        # Python packages
-        print(f"\n{BLUE}[2/7] Python Dependencies{RESET}")
-        self.check_python_package("fastapi")
-        self.check_python_package("uvicorn")
-        self.check_python_package("pydub")
-        self.check_python_package("google-generativeai", "google.generativeai")
-        self.check_python_package("pandas")
-        self.check_python_package("scikit-learn", "sklearn")
-        
-        # Configuration
-        print(f"\n{BLUE}[3/7] Configuration{RESET}")
-        self.check_env_file()
+        sections = [
+            ("[1/7] System Requirements", [
+                (self.check_python_version,),
+                (self.check_node_version,),
+                (self.check_ffmpeg,),
+            ]),
+            ("[2/7] Python Dependencies", [
+                (self.check_python_package, "fastapi"),
+                (self.check_python_package, "uvicorn"),
+                (self.check_python_package, "pydub"),
+                (self.check_python_package, "google-generativeai", "google.generativeai"),
+                (self.check_python_package, "pandas"),
+                (self.check_python_package, "scikit-learn", "sklearn"),
+            ]),
+            ("[3/7] Configuration", [(self.check_env_file,)]),
+            ("[4/7] WhatsApp Bot", [(self.check_whatsapp_node_modules,)]),
+            ("[5/7] Data Files", [(self.check_data_files,)]),
+        ]
         
-        # Node.js dependencies
-        print(f"\n{BLUE}[4/7] WhatsApp Bot{RESET}")
-        self.check_whatsapp_node_modules()
-        
-        # Data files
-        print(f"\n{BLUE}[5/7] Data Files{RESET}")
-        self.check_data_files()
+        # The checks are independent and mostly wait on subprocesses, imports and
+        # the filesystem, so start them all at once and report in declaration order
+        with ThreadPoolExecutor(max_workers=MAX_CHECK_WORKERS) as pool:
+            pending = [
+                (title, [pool.submit(self._run_check, *check) for check in checks])
+                for title, checks in sections
+            ]
+            for title, futures in pending:
+                print(f"\n{BLUE}{title}{RESET}")
+                for future in futures:
+                    self._merge(future.result())
         
         # Print summary
-        self.print_summary()
+        return self.print_summary()
 
     def print_summary(self):
         """Print check summary"""
@@ -279,9 +418,55 @@ class DependencyChecker:
             print("Fix the issues above before running the application.")
             return 1
 
+def _fingerprint() -> str:
+    """Hash everything the checks depend on: interpreter, tools, config, packages, data"""
+    paths = [
+        _resolve_binary('ffmpeg'),
+        _resolve_binary('node'),
+        ".env",
+        "whatsapp-bot/node_modules",
+        "data/agriculture_qna_expanded.csv",
+        # site-packages directories change mtime when distributions are added or removed
+        *sys.path,
+    ]
+    digest = hashlib.sha256(sys.version.encode())
+    digest.update(os.getcwd().encode())
+    for path in paths:
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            stat = None
+        stamp = f"{stat.st_mtime_ns}:{stat.st_size}" if stat else "missing"
+        digest.update(f"{path}={stamp}\n".encode())
+    return digest.hexdigest()
+
+def _cached_success(fingerprint: str) -> bool:
+    try:
+        cached = json.loads(CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return False
+    return (
+        cached.get("fingerprint") == fingerprint
+        and cached.get("ok") is True
+        and time.time() - cached.get("timestamp", 0) < CACHE_TTL_S
+    )
+
+def _store_success(fingerprint: str):
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_text(json.dumps({"fingerprint": fingerprint, "ok": True, "timestamp": time.time()}))
+    except OSError:
+        pass
+
 def main():
+    fingerprint = _fingerprint()
+    if "--force" not in sys.argv and _cached_success(fingerprint):
+        print_success("System check passed previously and nothing has changed (use --force to re-run)")
+        sys.exit(0)
     checker = DependencyChecker()
     exit_code = checker.run_all_checks()
+    if exit_code == 0:
+        _store_success(fingerprint)
     sys.exit(exit_code)
 
 if __name__ == "__main__":
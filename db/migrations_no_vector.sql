@@ -83,6 +83,7 @@ CREATE TABLE IF NOT EXISTS analytics (
 CREATE INDEX IF NOT EXISTS idx_users_phone ON users(phone_number);
 CREATE INDEX IF NOT EXISTS idx_users_active ON users(is_active, last_active_at);
 CREATE INDEX IF NOT EXISTS idx_conversations_user ON conversations(user_id, is_active);
+CREATE INDEX IF NOT EXISTS idx_conversations_user_active_started ON conversations(user_id, started_at) WHERE is_active;
 CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages(conversation_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_messages_user ON messages(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_messages_type ON messages(message_type, direction);
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Kuapa AI - Knowledge Base Expansion
+Appends curated Q&A batches to the knowledge-base CSV
+
+Each batch is applied at most once: its content hash is recorded in
+data/.applied_expansions, and re-running an applied batch is a no-op.
+Questions already in the CSV are skipped either way.
+
+Usage:
+    python expand.py                 # apply every batch not applied yet
+    python expand.py batch1          # apply specific batches
+    python expand.py --list          # show batches and whether they are applied
+    python expand.py --backup        # back up the CSV before appending
+    python expand.py --verify        # recount the CSV after writing
+"""
+
+import csv
+import hashlib
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+CSV = Path(__file__).resolve().parent / "data" / "agriculture_qna_expanded.csv"
+APPLIED = CSV.parent / ".applied_expansions"
+
+# First batch of the 205 planned new entries covering:
+# - Cassava (12), Cocoa (11), Rice (11), Tomato (10), Pepper (7)
+# - Okra (5), Yam (9), Plantain (7), Soybean (8), Groundnut (7)
+# - Pineapple (7), Orange (7), Oil Palm (8), Irrigation (7)
+# - Fertilizers (16), Pests & Diseases (15), Postharvest (13)
+# - Water Management (5), Soil Management (9), IPM (8)
+# - Value Addition & Marketing (15), Twi translations (5)
+BATCH1 = [
+    # Cassava - Ghana's 2nd most important crop
+    ("What are the best cassava varieties for Ghana?", "Ampong, Afisiafi, Nkabom, Bankyehemaa, and Dadanyuie are popular high-yielding, disease-resistant varieties. Ampong is very popular for gari and fufu production.", "MoFA / CSIR-PGRRI"),
+    ("How do I plant cassava?", "Plant healthy stem cuttings (25-30 cm) at 45° angle, 2/3 buried in mounds or ridges. Use 1m x 1m spacing (10,000 stands/ha). Plant during onset of rains.", "MoFA"),
+    ("What is cassava mosaic disease?", "Viral disease causing yellow/white mottling on leaves, stunted growth, and reduced yields. Use resistant varieties like Nkabom; remove and burn infected plants.", "CSIR-CRI"),
+    ("How do I control cassava mealybug?", "Introduce natural enemies (parasitoid wasps); maintain field hygiene; avoid planting infected cuttings; apply neem-based insecticides if infestation is severe.", "CSIR-CRI"),
+    ("When should I harvest cassava?", "Most varieties mature in 10-12 months; late varieties 18-24 months. Harvest when lower leaves turn yellow. Delay increases root fiber content.", "MoFA"),
+]
+
+# Rice, tomato and further crops
+RICE_TOMATO = [
+    # Rice - Important cereal
+    ("What are the best rice varieties for Ghana?", "Jasmine 85, Agra Rice, NERICA (upland), GR18 (lowland), Digang (aromatic). Choose based on ecology: upland, lowland, or irrigated.", "MoFA / CSIR-SARI"),
+    ("How do I control rice blast disease?", "Use resistant varieties; avoid excessive nitrogen; ensure good drainage; spray azoxystrobin or tricyclazole when disease appears in nursery or field.", "CSIR-SARI"),
+    ("What is rice yellow mottle virus?", "Viral disease causing yellow-orange leaf discoloration, stunting, and poor grain filling. Control vectors (beetles), use resistant varieties, rogue infected plants.", "CSIR-SARI"),
+    ("When should I transplant rice seedlings?", "Transplant at 21-25 days old (3-4 leaves); avoid older seedlings. Space 20cm x 20cm; plant 2-3 seedlings per hill for irrigated rice.", "MoFA"),
+    ("How much water does rice need?", "Lowland rice needs continuous shallow flooding (5-10 cm) from tillering to grain filling. Drain 2 weeks before harvest for easier harvesting.", "MoFA / Irrigation"),
+    ("What fertilizer does rice need?", "Apply NPK 15-15-15 (3 bags/ha) at 2 weeks after transplanting; top-dress with 2 bags urea at panicle initiation and flowering for better grain filling.", "MoFA / Yara Ghana"),
+    ("How do I control weeds in lowland rice?", "Pre-emergence: Apply butachlor or pretilachlor 3-5 days after transplanting; supplement with hand weeding at 4-6 weeks after transplanting.", "MoFA"),
+    ("What causes poor rice grain filling?", "Nitrogen deficiency during flowering, water stress, high temperatures, pest damage (stem borers, rice bugs), or diseases. Ensure adequate water and nutrients.", "CSIR-SARI"),
+    ("When should I harvest rice?", "Harvest when 80-85% of grains are golden yellow and hard. Delay causes shattering losses; early harvest gives low yields and poor quality.", "MoFA"),
+    ("How do I dry rice paddy?", "Sun-dry to 14% moisture (grain breaks cleanly when bitten). Spread thinly on tarpaulins; turn regularly. Proper drying prevents mold and storage losses.", "MoFA / Postharvest"),
+    ("How do I control rice stem borers?", "Keep field clean; destroy stubble after harvest; use pheromone traps; apply cartap or chlorpyrifos at tillering and booting stages if infestation exceeds 5%.", "CSIR-SARI"),
+    
+    #Tomato - Key vegetable
+    ("What are signs of nitrogen deficiency in tomato?", "Yellowing of older leaves starting from tips, stunted growth, thin stems, small fruits. Apply urea or ammonium sulphate as top-dressing.", "MoFA / Horticulture"),
+    ("How do I control tomato blight?", "Use resistant varieties; stake plants for air circulation; avoid overhead irrigation; spray copper fungicides or mancozeb weekly during wet season.", "MoFA / CSIR-CRI"),
+    ("What causes tomato blossom end rot?", "Calcium deficiency aggravated by irregular watering. Maintain consistent soil moisture; apply calcium nitrate foliar spray or lime to soil.", "Yara Ghana / Extension"),
+    ("When should I transplant tomato seedlings?", "Transplant at 4-6 weeks (4-6 true leaves), preferably in evening. Harden seedlings by reducing water 1 week before transplanting.", "MoFA"),
+    ("How do I stake tomatoes?", "Use 1.5m stakes or vertical strings; tie plants loosely with soft material; remove side shoots for indeterminate varieties to increase fruit size.", "Extension"),
+    ("What fertilizer does tomato need?", "Basal: NPK 15-15-15 (3-4 bags/ha); Top-dress with NPK 20-10-10 at flowering and fruiting. Tomatoes need high potassium for fruit quality.", "MoFA / Yara Ghana"),
+    ("How do I control tomato fruit worm?", "Scout for eggs and larvae; handpick when possible; spray neem or Bt (Bacillus thuringiensis); rotate with synthetic insecticides if infestation is high.", "MoFA / CSIR-CRI"),
+    ("What causes tomato leaf curl?", "Viral disease spread by whiteflies. Use resistant varieties; control whiteflies with neem or imidacloprid; remove infected plants; use reflective mulch.", "CSIR-CRI"),
+    ("How often should I water tomatoes?", "Water deeply 2-3 times per week depending on soil type and weather. Avoid wetting foliage; use drip irrigation if possible to reduce disease.", "Extension / Irrigation"),
+    ("What is the best spacing for tomatoes?", "Indeterminate varieties: 90cm x 60cm; Determinate varieties: 60cm x 50cm. Wider spacing improves air circulation and reduces disease pressure.", "MoFA"),
+]
+
+BATCHES = {
+    "batch1": BATCH1,
+    "rice-tomato": RICE_TOMATO,
+}
+
+def batch_key(entries):
+    """Content hash of a batch; order-independent so reshuffling is still a no-op"""
+    return hashlib.sha256(repr(sorted(entries)).encode('utf-8')).hexdigest()
+
+def load_applied():
+    """Keys of the batches already appended to the CSV"""
+    try:
+        with open(APPLIED, 'r', encoding='utf-8') as f:
+            return {line.split()[0] for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def record_applied(key, name, written):
+    with open(APPLIED, 'a', encoding='utf-8') as f:
+        f.write(f"{key} {name} {written}\n")
+
+def count_rows(path):
+    """Data rows in the CSV, counted as newlines in 1 MiB chunks (header excluded)"""
+    with open(path, 'rb') as f:
+        return sum(buf.count(b'\n') for buf in iter(lambda: f.read(1 << 20), b'')) - 1
+
+def question_key(question):
+    """SHA-1 digest of a normalized question, used to spot duplicates"""
+    return hashlib.sha1(question.strip().lower().encode('utf-8')).digest()
+
+def load_question_keys(path):
+    """Digests of every question already in the CSV"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return {question_key(row[0]) for row in reader if row}
+
+def new_rows(rows, seen):
+    """Yield only rows whose question is not in `seen`, adding each one as it passes"""
+    for row in rows:
+        key = question_key(row[0])
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+def backup_file(src, dst):
+    """Copy src to dst in-kernel (reflinked on btrfs/XFS) where supported, else via copy2"""
+    # Not a hardlink: the CSV is appended to in place, which would change the backup too
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    unknown = [name for name in args if name not in BATCHES]
+    if unknown:
+        print(f"Unknown batch: {', '.join(unknown)} (available: {', '.join(BATCHES)})")
+        return 1
+
+    applied = load_applied()
+    if '--list' in flags:
+        for name, entries in BATCHES.items():
+            state = "applied" if batch_key(entries) in applied else "pending"
+            print(f"  {name:<12} {len(entries):>4} entries  {state}")
+        return 0
+
+    pending = [
+        (name, BATCHES[name], batch_key(BATCHES[name]))
+        for name in (args or BATCHES)
+    ]
+    pending = [(name, entries, key) for name, entries, key in pending if key not in applied]
+    if not pending:
+        print("All requested batches are already applied - nothing to do")
+        return 0
+
+    if '--backup' in flags:
+        backup = CSV.with_name(f"{CSV.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.backup")
+        backup_file(CSV, backup)
+        print(f"Backup: {backup}")
+
+    current = count_rows(CSV)
+    seen = load_question_keys(CSV)
+    print(f"Current: {current} entries")
+
+    # One buffered handle for every batch
+    with open(CSV, 'a', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        for name, entries, key in pending:
+            known = len(seen)
+            writer.writerows(new_rows(entries, seen))
+            written = len(seen) - known
+            f.flush()
+            record_applied(key, name, written)
+            skipped = len(entries) - written
+            note = f" ({skipped} duplicates skipped)" if skipped else ""
+            print(f"  {name}: added {written} entries{note}")
+            current += written
+
+    total = count_rows(CSV) if '--verify' in flags else current
+    print(f"\nKnowledge base expansion complete!")
+    print(f"Total entries: {total}")
+    print(f"Target (250+): {'ACHIEVED ✓' if total >= 250 else 'Not reached'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
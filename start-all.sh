@@ -59,7 +59,7 @@ mkdir -p logs
 
 # Start Python Backend
 echo -e "${GREEN}🐍 Starting Python Backend (Port 8000)...${NC}"
-python -m uvicorn api.main:app --host 0.0.0.0 --port 8000 > logs/backend.log 2>&1 &
+python -m uvicorn api.main:app --host 0.0.0.0 --port 8000 --ws-per-message-deflate false --ws-max-size 65536 > logs/backend.log 2>&1 &
 BACKEND_PID=$!
 echo "Backend PID: $BACKEND_PID"
 echo $BACKEND_PID > logs/backend.pid
@@ -12,4 +12,4 @@ if [ ! -f .env ]; then
 fi
 
 # Start backend
-python -m uvicorn api.main:app --reload --host 0.0.0.0 --port 8000
+python -m uvicorn api.main:app --reload --host 0.0.0.0 --port 8000 --ws-per-message-deflate false --ws-max-size 65536
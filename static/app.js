@@ -2,6 +2,7 @@ let ws = null;
 let clientId = null;
 let reconnectAttempts = 0;
 const maxReconnectAttempts = 5;
+const textDecoder = new TextDecoder();
 
 const messageInput = document.getElementById('message-input');
 const sendButton = document.getElementById('send-button');
@@ -34,6 +35,8 @@ function connectWebSocket() {
     updateConnectionStatus('connecting');
 
     ws = new WebSocket(wsUrl);
+    // Responses arrive as binary JSON frames
+    ws.binaryType = 'arraybuffer';
 
     ws.onopen = () => {
         console.log('WebSocket connected');
@@ -44,7 +47,10 @@ function connectWebSocket() {
 
     ws.onmessage = (event) => {
         try {
-            const data = JSON.parse(event.data);
+            const text = typeof event.data === 'string'
+                ? event.data
+                : textDecoder.decode(event.data);
+            const data = JSON.parse(text);
 
             removeTypingIndicator();
 
@@ -7,26 +7,33 @@ Verifies database connection, tables, and basic operations
 import sys
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 
 # Colors for output
-GREEN = '\033[92m'
-RED = '\033[91m'
-YELLOW = '\033[93m'
-BLUE = '\033[94m'
-RESET = '\033[0m'
+# Escape codes are only emitted when writing to a terminal
+_USE_COLOR = sys.stdout.isatty()
+GREEN = '\033[92m' if _USE_COLOR else ''
+RED = '\033[91m' if _USE_COLOR else ''
+YELLOW = '\033[93m' if _USE_COLOR else ''
+BLUE = '\033[94m' if _USE_COLOR else ''
+RESET = '\033[0m' if _USE_COLOR else ''
+
+_OK_PREFIX = f"{GREEN}✓{RESET} "
+_ERROR_PREFIX = f"{RED}✗{RESET} "
+_WARNING_PREFIX = f"{YELLOW}⚠{RESET} "
+_INFO_PREFIX = f"{BLUE}ℹ{RESET} "
 
 def print_success(text):
-    print(f"{GREEN}✓{RESET} {text}")
+    print(_OK_PREFIX + text)
 
 def print_error(text):
-    print(f"{RED}✗{RESET} {text}")
+    print(_ERROR_PREFIX + text)
 
 def print_info(text):
-    print(f"{BLUE}ℹ{RESET} {text}")
+    print(_INFO_PREFIX + text)
 
 def print_warning(text):
-    print(f"{YELLOW}⚠{RESET} {text}")
+    print(_WARNING_PREFIX + text)
 
 def test_database():
     print("\n" + "="*60)
@@ -39,10 +46,10 @@ def test_database():
         print_error(".env file not found!")
         return False
     
-    load_dotenv(dotenv_path=env_path)
+    env = dotenv_values(env_path)
     
-    # Get DATABASE_URL
-    database_url = os.getenv('DATABASE_URL', '')
+    # Get DATABASE_URL; like load_dotenv, an exported variable wins over .env
+    database_url = os.environ.get('DATABASE_URL') or env.get('DATABASE_URL') or ''
     
     if not database_url:
         print_error("DATABASE_URL not set in .env file")
@@ -66,39 +73,31 @@ def test_database():
         engine = create_engine(database_url, echo=False)
         
         with engine.connect() as conn:
-            # Test basic query
-            result = conn.execute(text("SELECT version()"))
-            version = result.fetchone()[0]
+            # All diagnostics in one round-trip
+            version, db_name, has_pgvector, tables = conn.execute(text("""
+                SELECT
+                    substring(version() FROM 1 FOR 50),
+                    current_database(),
+                    EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'vector'),
+                    ARRAY(
+                        SELECT table_name::text
+                        FROM information_schema.tables
+                        WHERE table_schema = 'public'
+                        AND table_type = 'BASE TABLE'
+                        ORDER BY table_name
+                        LIMIT 100
+                    )
+            """)).one()
             print_success("Connected to PostgreSQL successfully")
-            print(f"  Version: {version[:50]}...")
-            
-            # Get current database
-            result = conn.execute(text("SELECT current_database()"))
-            db_name = result.fetchone()[0]
+            print(f"  Version: {version}...")
             print_success(f"Database: {db_name}")
             
-            # Check pgVector extension
-            result = conn.execute(text(
-                "SELECT EXISTS(SELECT 1 FROM pg_extension WHERE extname = 'vector')"
-            ))
-            has_pgvector = result.fetchone()[0]
-            
             if has_pgvector:
                 print_success("pgVector extension installed")
             else:
                 print_warning("pgVector extension not installed (optional - for semantic search)")
                 print_info("Database will work fine without it. Can add later if needed.")
             
-            # Check if tables exist
-            result = conn.execute(text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_type = 'BASE TABLE'
-                ORDER BY table_name
-            """))
-            tables = [row[0] for row in result.fetchall()]
-            
             if tables:
                 print_success("Tables created successfully")
                 print("\n" + BLUE + "Tables found:" + RESET)
@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs the app lifespan once per worker, which also
+    # builds the retriever index before the first /chat request
+    with TestClient(app) as c:
+        yield c
+
+@pytest.fixture(scope="session")
+def rag():
+    """retrieve_context, with the index built once up front for the session"""
+    from api.rag import retrieve_context, warm_retriever
+    warm_retriever()
+    return retrieve_context
+
+@pytest.fixture(scope="session")
+def retriever():
+    """The index the app itself serves from; search() must not mutate it"""
+    from api.rag import _get_retriever, warm_retriever
+    warm_retriever()
+    return _get_retriever()
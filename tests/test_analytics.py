@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from api import analytics, database
+from api.analytics import AnalyticsBuffer
+
+@pytest.fixture
+def buffer():
+    buf = AnalyticsBuffer()
+    buf.flushed = []
+    # Record batches instead of writing them to Postgres
+    buf._flush = buf.flushed.append
+    return buf
+
+async def test_analytics_flushes_when_batch_is_full(buffer, monkeypatch):
+    monkeypatch.setattr(analytics, "FLUSH_BATCH_SIZE", 3)
+    monkeypatch.setattr(analytics, "FLUSH_INTERVAL_S", 60.0)
+    buffer.start()
+    for i in range(3):
+        buffer.put(None, f"event_{i}")
+    for _ in range(50):
+        if buffer.flushed:
+            break
+        await asyncio.sleep(0.01)
+    assert [len(batch) for batch in buffer.flushed] == [3]
+    await buffer.stop()
+
+async def test_analytics_flushes_after_interval(buffer, monkeypatch):
+    monkeypatch.setattr(analytics, "FLUSH_BATCH_SIZE", 100)
+    monkeypatch.setattr(analytics, "FLUSH_INTERVAL_S", 0.05)
+    buffer.start()
+    buffer.put(None, "event")
+    await asyncio.sleep(0.3)
+    assert [len(batch) for batch in buffer.flushed] == [1]
+    assert buffer.flushed[0][0][1] == "event"
+    await buffer.stop()
+
+async def test_analytics_stop_flushes_queued_events(buffer, monkeypatch):
+    monkeypatch.setattr(analytics, "FLUSH_BATCH_SIZE", 100)
+    monkeypatch.setattr(analytics, "FLUSH_INTERVAL_S", 60.0)
+    buffer.start()
+    for i in range(5):
+        buffer.put(None, f"event_{i}")
+    await asyncio.sleep(0.05)
+    assert buffer.flushed == []
+    await buffer.stop()
+    assert [row[1] for batch in buffer.flushed for row in batch] == [f"event_{i}" for i in range(5)]
+    assert not buffer.running
+
+def test_analytics_flush_survives_unreachable_database(monkeypatch):
+    class DownEngine:
+        def raw_connection(self):
+            raise OSError("connection refused")
+    monkeypatch.setattr(database, "engine", DownEngine())
+    # Logged and dropped; must not raise into the drainer task
+    AnalyticsBuffer._flush([(None, "event", "{}", None)])
@@ -1,10 +1,10 @@
 import pytest
-from fastapi.testclient import TestClient
-from api.main import app
 
-client = TestClient(app)
+# Encoded once instead of on every request
+_PAYLOAD_NITROGEN = b'{"message":"What are symptoms of nitrogen deficiency in maize?"}'
+_JSON_HEADERS = {"content-type": "application/json"}
 
-def test_root_endpoint():
+def test_root_endpoint(client):
     response = client.get("/")
     assert response.status_code == 200
     data = response.json()
@@ -12,7 +12,7 @@ def test_root_endpoint():
     assert "version" in data
     assert data["version"] == "2.0.0"
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     response = client.get("/health")
     assert response.status_code == 200
     data = response.json()
@@ -20,11 +20,8 @@ def test_health_endpoint():
     assert data["status"] == "healthy"
     assert "openai_configured" in data
 
-def test_chat_endpoint_valid_request():
-    response = client.post(
-        "/chat",
-        json={"message": "What are symptoms of nitrogen deficiency in maize?"}
-    )
+def test_chat_endpoint_valid_request(client):
+    response = client.post("/chat", content=_PAYLOAD_NITROGEN, headers=_JSON_HEADERS)
     assert response.status_code == 200
     data = response.json()
     assert "response" in data
@@ -33,27 +30,24 @@ def test_chat_endpoint_valid_request():
     assert isinstance(data["response"], str)
     assert len(data["response"]) > 0
 
-def test_chat_endpoint_empty_message():
+def test_chat_endpoint_empty_message(client):
     response = client.post(
         "/chat",
         json={"message": ""}
     )
     assert response.status_code == 200
 
-def test_chat_endpoint_invalid_payload():
+def test_chat_endpoint_invalid_payload(client):
     response = client.post("/chat", json={})
     assert response.status_code == 422
 
-def test_chat_endpoint_known_question():
-    response = client.post(
-        "/chat",
-        json={"message": "What are symptoms of nitrogen deficiency in maize?"}
-    )
+def test_chat_endpoint_known_question(client):
+    response = client.post("/chat", content=_PAYLOAD_NITROGEN, headers=_JSON_HEADERS)
     assert response.status_code == 200
     data = response.json()
     assert len(data["response"]) > 0
     assert isinstance(data["response"], str)
 
-def test_audio_endpoint_missing_file():
+def test_audio_endpoint_missing_file(client):
     response = client.get("/audio/nonexistent.mp3")
     assert response.status_code == 404
@@ -1,17 +1,16 @@
 import pytest
-from api.rag import retrieve_context
 
-def test_retrieve_context_valid_query():
-    results = retrieve_context("What are symptoms of nitrogen deficiency?")
+def test_retrieve_context_valid_query(rag):
+    results = rag("What are symptoms of nitrogen deficiency?")
     assert isinstance(results, list)
     assert len(results) > 0
 
-def test_retrieve_context_empty_query():
-    results = retrieve_context("")
+def test_retrieve_context_empty_query(rag):
+    results = rag("")
     assert isinstance(results, list)
 
-def test_retrieve_context_returns_tuples():
-    results = retrieve_context("maize farming")
+def test_retrieve_context_returns_tuples(rag):
+    results = rag("maize farming")
     for result in results:
         assert len(result) == 3
         chunk, score, source = result
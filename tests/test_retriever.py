@@ -1,8 +1,11 @@
+import numpy as np
 import pytest
+from sklearn.metrics.pairwise import cosine_similarity
 from api.utils_fallback_retriever import FallbackRetriever
 
 @pytest.fixture
-def retriever():
+def fresh_retriever():
+    # add_rows() mutates the index, so those tests get their own copy
     return FallbackRetriever()
 
 def test_retriever_initialization(retriever):
@@ -34,3 +37,58 @@ def test_retriever_search_returns_sorted_results(retriever):
     if len(results) > 1:
         scores = [score for _, score, _ in results]
         assert scores == sorted(scores, reverse=True)
+
+def test_retriever_scores_are_cosine_similarity(retriever):
+    # Rows and queries are IDF-weighted and L2-normalized, so the plain dot
+    # product used for scoring must equal the cosine similarity
+    query = "nitrogen deficiency in maize"
+    results = retriever.search(query, k=3)
+    expected = cosine_similarity(retriever.transformer.transform(retriever.vectorizer.transform([query])), retriever.matrix).ravel()
+    assert [score for _, score, _ in results] == pytest.approx(np.sort(expected)[::-1][:3], rel=1e-5)
+
+def test_retriever_search_batch_matches_search(retriever):
+    queries = ["nitrogen deficiency in maize", "", "tomato blight", "maize"]
+    batched = retriever.search_batch(queries, k=5)
+    assert len(batched) == len(queries)
+    for query, results in zip(queries, batched):
+        expected = retriever.search(query, k=5)
+        # The paths sum in different orders, so equally scored rows may swap;
+        # compare the scores rather than which of the tied answers came first
+        assert [score for _, score, _ in results] == pytest.approx([score for _, score, _ in expected], rel=1e-5)
+
+def test_retriever_short_query_fast_path_matches_full_scan(retriever):
+    # Short queries are scored from the postings; the scores must be the ones
+    # the full corpus scan would produce
+    query = "tomato blight"
+    results = retriever.search(query, k=3)
+    full = cosine_similarity(retriever.transformer.transform(retriever.vectorizer.transform([query])), retriever.matrix).ravel()
+    assert [score for _, score, _ in results] == pytest.approx(np.sort(full)[::-1][:3], rel=1e-5)
+
+def test_retriever_add_rows_is_searchable(fresh_retriever):
+    n_rows = fresh_retriever.matrix.shape[0]
+    fresh_retriever.add_rows(["How do I store shea butter?"], ["Keep it cool and dry."], ["test"])
+    assert fresh_retriever.matrix.shape[0] == len(fresh_retriever.df) == n_rows + 1
+    # Long query: ranked by the full corpus scan
+    answer, _, source = fresh_retriever.search("storing shea butter long term", k=1)[0]
+    assert (answer, source) == ("Keep it cool and dry.", "test")
+
+def test_retriever_add_rows_invalidates_result_cache(fresh_retriever):
+    # Short query: ranked from the postings, which must pick up the new row too
+    before = fresh_retriever.search("shea", k=1)
+    fresh_retriever.add_rows(["shea"], ["Shea answer"])
+    after = fresh_retriever.search("shea", k=1)
+    assert after != before
+    assert after[0][0] == "Shea answer"
+    assert after[0][1] == pytest.approx(1.0)
+
+def test_retriever_add_rows_rejects_mismatched_sources(fresh_retriever):
+    with pytest.raises(ValueError):
+        fresh_retriever.add_rows(["q1", "q2"], ["a1", "a2"], ["s1"])
+    assert fresh_retriever.matrix.shape[0] == len(fresh_retriever.df)
+
+def test_retriever_top_k_breaks_ties_by_row_index():
+    # Both scoring paths rank through _top_k, so equal scores must come back
+    # in the same order whichever rows argpartition happens to pick
+    scores = np.array([0.5, 0.9, 0.5, 0.5, 0.1, 0.5], dtype=np.float32)
+    assert FallbackRetriever._top_k(scores, 3).tolist() == [1, 0, 2]
+    assert FallbackRetriever._top_k(scores, 6).tolist() == [1, 0, 2, 3, 5, 4]